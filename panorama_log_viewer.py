@@ -1,29 +1,148 @@
 import rumps
+from PyObjCTools import AppHelper
 import requests
-import xml.etree.ElementTree as ET
+import atexit
+import urllib3
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+try:
+    import lxml.etree as ET
+except ImportError:
+    import xml.etree.ElementTree as ET
 import os
+import re
 import json
+try:
+    import orjson
+except ImportError:
+    orjson = None
 from datetime import datetime
 import time
+import random
+import threading
 from collections import defaultdict
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
 from pathlib import Path
 
-CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.json")
+_MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+CONFIG_PATH = os.path.join(_MODULE_DIR, "config.json")
+
+# Keygen and job kickoff responses are tiny and fixed-shape, so match them directly
+_KEY_RE = re.compile(rb"<key>([^<]+)</key>")
+_JOB_RE = re.compile(rb"<job>(\d+)</job>")
+
+# Deletes every ASCII character that isn't allowed in cache filenames
+_SANITIZE = str.maketrans({c: None for c in map(chr, range(128)) if not (c.isalnum() or c in ".-_")})
+
+# JSON codec for the log cache, which is read and written line by line as bytes
+if orjson:
+    _json_loads = orjson.loads
+
+    def _json_line(obj):
+        return orjson.dumps(obj) + b"\n"
+else:
+    _json_loads = json.loads
+
+    def _json_line(obj):
+        return json.dumps(obj).encode("utf-8") + b"\n"
+
+_MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
 
 
 class PanoramaAdminLogAppV2(rumps.App):
     VERSION = "1.2.023"
 
+    # (log dict key, API entry tag) pairs cached for each log type
+    CONFIG_LOG_FIELDS = (
+        ("Received", "receive_time"),
+        ("Firewall Serial", "serial"),
+        ("Device Name", "device_name"),
+        ("Source IP", "host"),
+        ("Command Type", "cmd"),
+        ("Admin", "admin"),
+        ("Access Method", "client"),
+        ("Result", "result"),
+        ("Config Section", "path"),
+        ("Full Path", "full-path"),
+    )
+    SYSTEM_LOG_FIELDS = (
+        ("Time", "time_generated"),
+        ("Type", "type"),
+        ("Severity", "severity"),
+        ("Event", "eventid"),
+        ("Description", "opaque"),
+        ("Admin", "admin"),
+        ("Host", "host"),
+        ("Client", "client"),
+    )
+    # The same pairs keyed by tag, for matching an entry's children in one pass
+    CONFIG_LOG_TAGS = {tag: key for key, tag in CONFIG_LOG_FIELDS}
+    SYSTEM_LOG_TAGS = {tag: key for key, tag in SYSTEM_LOG_FIELDS}
+
+    # Menu emoji for the exact Panorama cmd values; anything else goes through cmd_type_emoji()
+    CMD_EMOJI = {
+        "set": "⚙️",
+        "edit": "✏️",
+        "revert": "↩️",
+        "commit-and-push": "📤",
+        "commit": "✅",
+        "delete": "🗑️",
+        "add": "➕",
+        "move": "📦",
+        "rename": "📝",
+        "multi-clone": "🧬",
+        "multi-move": "🛫",
+        "upload": "📤",
+        "request": "📥",
+        "clone": "🔁",
+        "override": "⛔",
+    }
+
+    # Log entries created per submenu before a "More…" item loads the next batch
+    MENU_BATCH_SIZE = 200
+    # Command-type submenus with more entries than this get a "Show…" placeholder instead
+    MENU_EAGER_SIZE = 25
+
+    # Log job status polling: the interval doubles from the first delay up to the cap,
+    # and a job is abandoned once the wait budget (seconds) is used up
+    JOB_POLL_FIRST_DELAY = 0.25
+    JOB_POLL_MAX_DELAY = 4.0
+    JOB_POLL_MAX_WAIT = 150
+
     def __init__(self):
         icon_file = "pan-logo-1.png"
-        icon_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), icon_file)
+        icon_path = os.path.join(_MODULE_DIR, icon_file)
         if not os.path.exists(icon_path):
             icon_path = None
         self.system_logs = []
         self.failed_commits = []
+        self.config_logs_grouped = {}
+        self.failed_commits_grouped = {}
         self.panorama_id = None
         self.panoramas = {}
 
+        # Shared HTTP session so parallel downloads reuse pooled connections
+        self.session = self.create_http_session()
+        # Held from the start of a sync until its menus are rebuilt on the main thread
+        self._sync_lock = threading.Lock()
+        # Highest search_results_NNN.txt number, found on the first search
+        self._search_counter = None
+        # log type -> (cache file signature, parsed results) from the last clean parse
+        self._parsed_caches = {}
+        # log type -> (cache file signature, Log IDs in that file or buffered for it)
+        self._cached_log_ids = {}
+        # Entries downloaded inside buffered_cache_writes(), written once the block exits;
+        # _buffering counts the open blocks per log type
+        self._pending_cache_writes = {}
+        self._buffering = defaultdict(int)
+        self._pending_lock = threading.Lock()
+        # Quit ends the process through NSApplication.terminate_, which skips atexit,
+        # so flush from rumps' before_quit; atexit still covers other exits
+        rumps.events.before_quit.register(self.flush_cache_writes)
+        atexit.register(self.flush_cache_writes)
+
         # Set up secure cache directory
         self.cache_dir = self.get_secure_cache_dir()
         self.ensure_cache_dir_exists()
@@ -57,7 +176,7 @@ class PanoramaAdminLogAppV2(rumps.App):
         # Create Sync submenu
         self.sync_menu = rumps.MenuItem("Sync", callback=None)
         self.sync_menu.add(rumps.MenuItem("Refresh Logs", callback=self.refresh_logs))
-        self.sync_menu.add(rumps.MenuItem("Parse Saved Config Logs", callback=self.parse_saved_config_logs))
+        self.sync_menu.add(rumps.MenuItem("Parse Saved Config Logs", callback=self.reparse_saved_config_logs))
         self.sync_menu.add(rumps.MenuItem("Force Clear and Reload Logs", callback=self.force_clear_and_reload_logs))
         self.sync_menu.add(rumps.separator)
         self.sync_menu.add(rumps.MenuItem("Sync 5000 Logs", callback=self.pull_extended_logs))
@@ -80,13 +199,22 @@ class PanoramaAdminLogAppV2(rumps.App):
         self.system_log_menu = rumps.MenuItem("Show System Log Entries", callback=None)
         self.failed_commit_menu = rumps.MenuItem("Show Failed Commits", callback=None)
 
-        self.menu.add(self.config_log_menu)
-        self.menu.add(self.system_log_menu)
-        self.menu.add(self.failed_commit_menu)
+        self.menu.update([self.config_log_menu, self.system_log_menu, self.failed_commit_menu])
 
         # Refresh logs
         self.refresh_logs(None)
 
+    def create_http_session(self):
+        """Create a keep-alive session shared by all Panorama API calls."""
+        # Panorama appliances commonly use self-signed certificates
+        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+        session = requests.Session()
+        session.verify = False
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8,
+                              max_retries=Retry(total=2, backoff_factor=0.3))
+        session.mount("https://", adapter)
+        return session
+
     def get_secure_cache_dir(self):
         """Get secure application cache directory."""
         if hasattr(os, 'getuid'):  # Unix-like systems (macOS/Linux)
@@ -108,34 +236,61 @@ class PanoramaAdminLogAppV2(rumps.App):
         except Exception as e:
             print(f"Warning: Could not create secure cache directory: {e}")
             # Fallback to current directory
-            self.cache_dir = os.path.dirname(os.path.abspath(__file__))
+            self.cache_dir = _MODULE_DIR
+
+    @property
+    def panorama(self):
+        return self._panorama
+
+    @panorama.setter
+    def panorama(self, name):
+        # Cache file paths only change with the active panorama, so build them here once
+        self._panorama = name
+        self._safe_panorama_name = self.sanitize_name(name)
+        self._cache_paths = {
+            log_type: os.path.join(self.cache_dir, self.get_cache_file_name(self._safe_panorama_name, log_type))
+            for log_type in ("config", "system")
+        }
+
+    @staticmethod
+    def sanitize_name(name):
+        """Strip characters that aren't safe in a cache filename."""
+        if name.isascii():
+            return name.translate(_SANITIZE)
+        return "".join(c for c in name if c.isalnum() or c in ".-_")
+
+    @staticmethod
+    def get_cache_file_name(safe_name, log_type):
+        """Get the cache filename for a sanitized panorama name."""
+        return f"{safe_name}_{log_type}_log.jsonl"
 
     def get_cache_file_path(self, log_type):
         """Get secure path for cache files."""
-        # Sanitize panorama name for filename
-        safe_name = "".join(c for c in self.panorama if c.isalnum() or c in ".-_")
-        filename = f"{safe_name}_raw_{log_type}_log.xml"
-        return os.path.join(self.cache_dir, filename)
+        return self._cache_paths[log_type]
 
     def clear_cache_files(self, panorama_name=None):
         """Clear cache files for specific panorama or all."""
         try:
             if panorama_name:
                 # Clear specific panorama files
-                safe_name = "".join(c for c in panorama_name if c.isalnum() or c in ".-_")
+                safe_name = self.sanitize_name(panorama_name)
                 for log_type in ['config', 'system']:
-                    cache_file = os.path.join(self.cache_dir, f"{safe_name}_raw_{log_type}_log.xml")
-                    if os.path.exists(cache_file):
-                        os.remove(cache_file)
-                        print(f"Removed cache file: {cache_file}")
+                    # The XML cache is what versions before the JSONL cache wrote
+                    for filename in (self.get_cache_file_name(safe_name, log_type),
+                                     f"{safe_name}_raw_{log_type}_log.xml"):
+                        cache_file = os.path.join(self.cache_dir, filename)
+                        if os.path.exists(cache_file):
+                            os.remove(cache_file)
+                            print(f"Removed cache file: {cache_file}")
             else:
                 # Clear all cache files
                 if os.path.exists(self.cache_dir):
-                    for file in os.listdir(self.cache_dir):
-                        if file.endswith('.xml'):
-                            file_path = os.path.join(self.cache_dir, file)
-                            os.remove(file_path)
-                            print(f"Removed cache file: {file_path}")
+                    with os.scandir(self.cache_dir) as it:
+                        for entry in it:
+                            # .xml files are caches written by older versions
+                            if entry.name.endswith(('.jsonl', '.xml')) and entry.is_file():
+                                os.remove(entry.path)
+                                print(f"Removed cache file: {entry.path}")
                     print("Cleared all cache files")
         except Exception as e:
             print(f"Error clearing cache files: {e}")
@@ -159,50 +314,35 @@ class PanoramaAdminLogAppV2(rumps.App):
         self.failed_commit_menu = rumps.MenuItem("Show Failed Commits", callback=None)
 
         # Add them back to the main menu
-        self.menu.add(self.config_log_menu)
-        self.menu.add(self.system_log_menu)
-        self.menu.add(self.failed_commit_menu)
+        self.menu.update([self.config_log_menu, self.system_log_menu, self.failed_commit_menu])
 
         print("Cleared and recreated all log menus")
 
     def clear_all_cache(self, _):
         """Menu callback to clear all cache files."""
+        # The sync worker appends to these files until it finishes
+        if self.refuse_during_sync("clearing the cache"):
+            return
         self.clear_cache_files()
         rumps.alert("Cache Cleared", "All cached log files have been removed.")
 
     def pull_10000_logs(self, _):
-        try:
-            # Clear existing data structures
-            self.config_logs = []
-            self.system_logs = []
-            self.failed_commits = []
-
-            # Clear existing menus completely
-            self.clear_log_menus()
+        self.start_sync(self.download_10000_logs,
+                        "10,000 log sync completed successfully (2 x 5000 chunks).")
 
-            # Download logs in chunks due to API 5000-log limit
-            print("Downloading 10,000 logs in two 5000-log chunks due to API limitations...")
+    def download_10000_logs(self):
+        # Download logs in chunks due to API 5000-log limit
+        print("Downloading 10,000 logs in two 5000-log chunks due to API limitations...")
 
-            # First chunk: most recent 5000 logs
-            self.download_and_merge_logs("config", nlogs=5000)
-            self.download_and_merge_logs("system", nlogs=5000)
+        # Config and system logs download in parallel; each log type fetches
+        # its chunks in order since both chunks append to the same cache file
+        self.run_downloads(partial(self.download_paginated_logs, "config", 10000),
+                           partial(self.download_paginated_logs, "system", 10000))
 
-            # Second chunk: next 5000 logs (using skip parameter)
-            print("Downloading second chunk of 5000 logs...")
-            self.download_and_merge_logs_with_skip("config", nlogs=5000, skip=5000)
-            self.download_and_merge_logs_with_skip("system", nlogs=5000, skip=5000)
-
-            # Parse all collected logs
-            self.parse_saved_config_logs(None)
-            self.parse_saved_system_logs()
-
-            # Rebuild menus with fresh data
-            self.build_config_log_menu()
-            self.build_system_log_menu()
-            self.build_failed_commit_menu()
-            rumps.alert("Sync Complete", "10,000 log sync completed successfully (2 x 5000 chunks).")
-        except Exception as e:
-            rumps.alert("Sync Failed", f"An error occurred during sync:\n{e}")
+    def download_paginated_logs(self, log_type, total):
+        """Download `total` logs of one type, one API page after another."""
+        for _ in self.paginate_logs(log_type, total):
+            pass
 
     def search_logs(self, _):
         import subprocess
@@ -235,29 +375,25 @@ class PanoramaAdminLogAppV2(rumps.App):
             if not term:
                 return
 
-        matches = []
-        for log in getattr(self, 'config_logs', []):
-            for value in log.values():
-                if term.lower() in str(value).lower():
-                    matches.append(log)
-                    break
+        needle = term.lower()
+        matches = [log for log in getattr(self, 'config_logs', []) if needle in log["_search_blob"]]
         if not matches:
             rumps.alert("No matching entries found.")
             return
 
         # Generate a unique search result filename in cache directory
-        base = "search_results"
-        i = 1
-        while os.path.exists(os.path.join(self.cache_dir, f"{base}_{i:03}.txt")):
-            i += 1
-        filename = os.path.join(self.cache_dir, f"{base}_{i:03}.txt")
-
-        # Write results to the unique filename for user access
+        filename = self.next_search_results_path()
+
+        # Write results to the unique filename for user access. Config logs all share
+        # the same fields, so sort the keys once and write the report in one call.
+        keys = sorted(k for k in matches[0] if not k.startswith("_"))
+        separator = "\n" + "-" * 80 + "\n\n"
+        report = "".join(
+            "".join(f"{k}: {log.get(k)}\n" for k in keys) + separator
+            for log in matches
+        )
         with open(filename, "w") as f:
-            for log in matches:
-                for k, v in sorted(log.items()):
-                    f.write(f"{k}: {v}\n")
-                f.write("\n" + "-" * 80 + "\n\n")
+            f.write(report)
 
         rumps.alert("Search Results Exported", f"{len(matches)} result(s) exported to {filename}")
 
@@ -289,10 +425,30 @@ class PanoramaAdminLogAppV2(rumps.App):
             if 0 <= idx < len(matches):
                 self.show_entry_details(matches[idx])
 
+    def next_search_results_path(self):
+        """Reserve the next unused search_results_NNN.txt file in the cache directory."""
+        if self._search_counter is None:
+            # Probe the directory once, then keep counting in memory
+            self._search_counter = 0
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    match = re.fullmatch(r"search_results_(\d+)\.txt", entry.name)
+                    if match:
+                        self._search_counter = max(self._search_counter, int(match.group(1)))
+        while True:
+            self._search_counter += 1
+            filename = os.path.join(self.cache_dir, f"search_results_{self._search_counter:03}.txt")
+            try:
+                # Exclusive create, so a concurrent search can't claim the same name
+                with open(filename, "x"):
+                    return filename
+            except FileExistsError:
+                continue
+
     def load_config(self):
         if os.path.exists(CONFIG_PATH):
-            with open(CONFIG_PATH, "r") as f:
-                data = json.load(f)
+            with open(CONFIG_PATH, "rb") as f:
+                data = _json_loads(f.read())
                 self.panoramas = data.get("panoramas", {})
                 self.panorama = data.get("active", "")
                 self.hide_panorama_users = data.get("hide_panorama_users", False)
@@ -315,118 +471,64 @@ class PanoramaAdminLogAppV2(rumps.App):
             "hide_panorama_users": self.hide_panorama_users,
             "display_menu_icon": self.display_menu_icon
         }
-        with open(CONFIG_PATH, "w") as f:
-            json.dump(data, f)
+        # Write to a temp file and swap it in, so a crash mid-write can't corrupt the config
+        tmp_path = CONFIG_PATH + ".tmp"
+        with open(tmp_path, "wb") as f:
+            if orjson:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+            else:
+                f.write(json.dumps(data, indent=2).encode("utf-8"))
+            f.flush()
+            os.fsync(f.fileno())
+        # The config holds API keys, and the temp file is a fresh inode with default permissions
+        os.chmod(tmp_path, 0o600)
+        os.replace(tmp_path, CONFIG_PATH)
 
     def prompt_for_credentials(self, _=None):
         import subprocess
 
+        # A running sync would keep fetching from, and caching for, the old Panorama
+        if self.refuse_during_sync("logging in"):
+            return
+
+        # Unit separator: can't be typed into a dialog, so it safely splits the answers
+        field_separator = "\x1f"
         try:
-            # Use AppleScript for better focus handling
-            panorama_script = '''
+            # Use AppleScript for better focus handling. All three dialogs run in one
+            # script so login only starts a single osascript process, and the script
+            # returns just the answers rather than the "text returned:" record.
+            # The password dialog skips "with hidden answer", which crashed on some systems.
+            login_script = '''
             tell application "System Events"
                 activate
-                display dialog "Enter Panorama URL or IP:" default answer "" with title "Panorama Login"
+                set panoramaAnswer to text returned of (display dialog "Enter Panorama URL or IP:" default answer "" with title "Panorama Login")
+                if panoramaAnswer is "" then return ""
+                set userAnswer to text returned of (display dialog "Enter Username:" default answer "" with title "Panorama Login")
+                if userAnswer is "" then return ""
+                set passwordAnswer to text returned of (display dialog "Enter Password (will be visible):" default answer "" with title "Panorama Login")
             end tell
+            return panoramaAnswer & (character id 31) & userAnswer & (character id 31) & passwordAnswer
             '''
-            result = subprocess.run(['osascript', '-e', panorama_script],
-                                    capture_output=True, text=True, timeout=30)
-            print(
-                f"Panorama dialog result: {result.returncode}, stdout: {repr(result.stdout)}, stderr: {repr(result.stderr)}")
+            result = subprocess.run(['osascript', '-e', login_script],
+                                    capture_output=True, text=True, timeout=90)
+            print(f"Login dialog result: {result.returncode}, stderr: {repr(result.stderr)}")
 
             if result.returncode != 0:
-                print("User cancelled panorama dialog or error occurred")
-                return  # User cancelled
-
-            # Extract the text from AppleScript result - more robust parsing
-            try:
-                if 'text returned:' in result.stdout:
-                    panorama = result.stdout.strip().split('text returned:')[1].split(',')[0].strip()
-                    # Remove any quotes and newlines that might be around the text
-                    panorama = panorama.strip('"').strip("'").strip('\n').strip()
-                else:
-                    print("No 'text returned:' found in panorama output")
-                    return self.prompt_for_credentials_fallback()
-            except Exception as e:
-                print(f"Error parsing panorama result: {e}")
+                if "(-128)" in result.stderr:
+                    print("User cancelled login dialog")
+                    return  # User cancelled
+                print("Login dialog failed, trying fallback")
+                # If AppleScript fails, try the fallback method completely
                 return self.prompt_for_credentials_fallback()
 
-            if not panorama:
-                print("Empty panorama value")
+            values = [value.strip() for value in result.stdout.rstrip("\n").split(field_separator)]
+            if len(values) != 3 or not all(values):
+                print("Empty login value")
                 return
+            panorama, user, password = values
 
             print(f"Panorama extracted: {repr(panorama)}")
-
-            user_script = '''
-            tell application "System Events"
-                activate
-                display dialog "Enter Username:" default answer "" with title "Panorama Login"
-            end tell
-            '''
-            result = subprocess.run(['osascript', '-e', user_script],
-                                    capture_output=True, text=True, timeout=30)
-            print(
-                f"Username dialog result: {result.returncode}, stdout: {repr(result.stdout)}, stderr: {repr(result.stderr)}")
-
-            if result.returncode != 0:
-                print("User cancelled username dialog or error occurred")
-                return  # User cancelled
-
-            # Extract the text from AppleScript result - more robust parsing
-            try:
-                if 'text returned:' in result.stdout:
-                    user = result.stdout.strip().split('text returned:')[1].split(',')[0].strip()
-                    # Remove any quotes and newlines that might be around the text
-                    user = user.strip('"').strip("'").strip('\n').strip()
-                else:
-                    print("No 'text returned:' found in username output")
-                    return self.prompt_for_credentials_fallback()
-            except Exception as e:
-                print(f"Error parsing username result: {e}")
-                return self.prompt_for_credentials_fallback()
-
-            if not user:
-                print("Empty username value")
-                return
-
             print(f"Username extracted: {repr(user)}")
-
-            # Try a simpler AppleScript approach for password without "with hidden answer"
-            # This might avoid the system crash while still providing focus
-            print("Trying simplified AppleScript for password")
-            password_script = '''
-            tell application "System Events"
-                activate
-                display dialog "Enter Password (will be visible):" default answer "" with title "Panorama Login"
-            end tell
-            '''
-            result = subprocess.run(['osascript', '-e', password_script],
-                                    capture_output=True, text=True, timeout=30)
-            print(
-                f"Password dialog result: {result.returncode}, stdout: {repr(result.stdout)}, stderr: {repr(result.stderr)}")
-
-            if result.returncode != 0:
-                print("Password dialog failed, trying fallback")
-                # If AppleScript fails, try the fallback method completely
-                return self.prompt_for_credentials_fallback()
-
-            # Extract the text from AppleScript result
-            try:
-                if 'text returned:' in result.stdout:
-                    password = result.stdout.strip().split('text returned:')[1].split(',')[0].strip()
-                    # Remove any quotes and newlines that might be around the text
-                    password = password.strip('"').strip("'").strip('\n').strip()
-                else:
-                    print("No 'text returned:' found in password output")
-                    return self.prompt_for_credentials_fallback()
-            except Exception as e:
-                print(f"Error parsing password result: {e}")
-                return self.prompt_for_credentials_fallback()
-
-            if not password:
-                print("Empty password value")
-                return
-
             print(f"Password entered (length): {len(password)}")
 
         except subprocess.TimeoutExpired:
@@ -438,32 +540,7 @@ class PanoramaAdminLogAppV2(rumps.App):
             # Fallback to rumps dialogs
             return self.prompt_for_credentials_fallback()
 
-        print(f"Proceeding with API call: panorama={panorama}, user={user}")
-
-        # Continue with API key generation
-        keygen_url = f"https://{panorama}/api/?type=keygen&user={user}&password={password}"
-        try:
-            r = requests.get(keygen_url, verify=False, timeout=10)
-            root = ET.fromstring(r.text)
-            key = root.findtext(".//key")
-            if not key:
-                rumps.alert("Login Failed",
-                            "Unable to retrieve API key. Please check your credentials and Panorama URL.")
-                return
-            if key:
-                new_id = len(self.panoramas) + 1
-                self.panoramas[panorama] = {"api_key": key, "id": new_id}
-                self.panorama = panorama
-                self.api_key = key
-                self.panorama_id = new_id
-                self.save_config()
-                self.update_title()
-                self.build_switch_panorama_menu()  # Rebuild switch menu
-                self.refresh_logs(None)
-                print("Successfully added new panorama")
-        except Exception as e:
-            print(f"API call failed: {e}")
-            rumps.alert("Login Failed", str(e))
+        self.finalize_credentials(panorama, user, password)
 
     def prompt_for_credentials_fallback(self, _=None):
         """Fallback method using rumps dialogs if AppleScript fails."""
@@ -477,318 +554,459 @@ class PanoramaAdminLogAppV2(rumps.App):
         if not password:
             return
 
+        self.finalize_credentials(panorama, user, password)
+
+    def finalize_credentials(self, panorama, user, password):
+        """Generate an API key for the entered credentials and make that Panorama active."""
+        print(f"Proceeding with API call: panorama={panorama}, user={user}")
+
         keygen_url = f"https://{panorama}/api/?type=keygen&user={user}&password={password}"
         try:
-            r = requests.get(keygen_url, verify=False, timeout=10)
-            root = ET.fromstring(r.text)
-            key = root.findtext(".//key")
+            r = self.session.get(keygen_url, timeout=10)
+            match = _KEY_RE.search(r.content)
+            if match:
+                key = match.group(1).decode()
+            else:
+                # Unexpected response shape, fall back to a real XML parse
+                key = ET.fromstring(r.content).findtext(".//key")
             if not key:
                 rumps.alert("Login Failed",
                             "Unable to retrieve API key. Please check your credentials and Panorama URL.")
                 return
-            if key:
-                new_id = len(self.panoramas) + 1
-                self.panoramas[panorama] = {"api_key": key, "id": new_id}
-                self.panorama = panorama
-                self.api_key = key
-                self.panorama_id = new_id
-                self.save_config()
-                self.update_title()
-                self.build_switch_panorama_menu()  # Rebuild switch menu
-                self.refresh_logs(None)
+            # Update an existing entry in place, keeping its id on re-login
+            info = self.panoramas.setdefault(panorama, {})
+            if not isinstance(info, dict):
+                info = self.panoramas[panorama] = {}
+            info["api_key"] = key
+            info.setdefault("id", len(self.panoramas))
+            self.panorama = panorama
+            self.api_key = key
+            self.panorama_id = info["id"]
+            self.save_config()
+            self.update_title()
+            self.build_switch_panorama_menu()  # Rebuild switch menu
+            self.refresh_logs(None)
+            print("Successfully added new panorama")
         except Exception as e:
+            print(f"API call failed: {e}")
             rumps.alert("Login Failed", str(e))
 
     def refresh_logs(self, _):
-        # Clear cached logs before loading new ones
-        self.config_logs = []
-        self.system_logs = []
-        self.failed_commits = []
-
         if not self.api_key or not self.panorama:
+            # Clear cached logs before prompting for a Panorama to load new ones from
+            self.reset_log_data()
             self.prompt_for_credentials()
             return
+        self.start_sync(self.download_fresh_logs)
 
-        # Clear menus completely using the new helper method
-        self.clear_log_menus()
-
+    def download_fresh_logs(self):
         # Delete old cache files before loading new ones
-        config_file = self.get_cache_file_path("config")
-        system_file = self.get_cache_file_path("system")
-        if os.path.exists(config_file):
-            os.remove(config_file)
-            print(f"Removed old config file: {config_file}")
-        if os.path.exists(system_file):
-            os.remove(system_file)
-            print(f"Removed old system file: {system_file}")
+        for log_type in ("config", "system"):
+            cache_file = self.get_cache_file_path(log_type)
+            if os.path.exists(cache_file):
+                os.remove(cache_file)
+                print(f"Removed old {log_type} file: {cache_file}")
 
         # Download fresh logs
-        self.download_and_merge_logs("config")
-        self.download_and_merge_logs("system")
-
-        # Parse the fresh logs
-        self.parse_saved_config_logs(None)
-        self.parse_saved_system_logs()
-
-        # Rebuild menus with fresh data
-        self.build_config_log_menu()
-        self.build_system_log_menu()
-        self.build_failed_commit_menu()
-
-        print(
-            f"Refreshed logs for {self.panorama}: {len(getattr(self, 'config_logs', []))} config, {len(self.system_logs)} system")
-
-    def download_and_merge_logs(self, log_type, nlogs=None):
-        nlogs_param = f"&nlogs={nlogs}" if nlogs else ""
-        print(f"Requesting {log_type} logs from {self.panorama} (nlogs={nlogs})...")
-        base_url = f"https://{self.panorama}/api/?type=log&log-type={log_type}{nlogs_param}&key={self.api_key}"
+        self.run_downloads(partial(self.download_and_merge_logs, "config"),
+                           partial(self.download_and_merge_logs, "system"))
 
+    def reset_log_data(self):
+        """Drop the parsed logs so nothing from the previous sync or Panorama lingers."""
+        self.config_logs = []
+        self.system_logs = []
+        self.failed_commits = []
+        self.config_logs_grouped = {}
+        self.failed_commits_grouped = {}
+
+    def start_sync(self, download, done_message=None):
+        """Run a log sync on a worker thread so the menu bar stays responsive.
+
+        `download` fills the cache on the worker, which then parses it; the menus
+        (and the `done_message` alert, if any) are rebuilt on the main thread by
+        finish_sync(). Only one sync runs at a time.
+        """
+        if not self._sync_lock.acquire(blocking=False):
+            rumps.alert("Sync In Progress", "Logs are still being downloaded. Please wait for the current sync to finish.")
+            return
         try:
-            r = requests.get(base_url, verify=False, timeout=10)
-            print(f"API Response status: {r.status_code}")
-            root = ET.fromstring(r.text)
-
-            # Check for API errors
-            status = root.get('status')
-            if status == 'error':
-                error_msg = root.findtext('.//msg')
-                print(f"API Error: {error_msg}")
-                return
-
-            job_id = root.findtext(".//job")
-            if not job_id:
-                print(f"No job ID received for {log_type} logs")
-                print(f"Response: {r.text[:500]}...")  # Print first 500 chars for debugging
-                return
+            self.reset_log_data()
+            # Clear existing menus completely
+            self.clear_log_menus()
+        except Exception:
+            self._sync_lock.release()
+            raise
 
-            # GUI notification: job started
+        def sync_worker():
+            error = None
             try:
-                rumps.notification("Panorama Logs", f"Downloading {log_type} logs",
-                                   f"Job started (requesting {nlogs or 'default'} logs)...")
+                download()
+                self.parse_saved_config_logs(None)
+                self.parse_saved_system_logs()
             except Exception as e:
-                print(f"Notification error (ignored): {e}")
+                error = e
+            # rumps menus and alerts must only be touched from the main thread
+            AppHelper.callAfter(self.finish_sync, error, done_message)
 
-            print(f"Log job {job_id} started, waiting for completion...")
-            # Increase to 60 attempts (~2 minutes)
-            for attempt in range(60):
-                # GUI status: update menu bar title with progress (only if not using icon-only mode)
-                if not self.display_menu_icon:
-                    self.title = f"Fetching {log_type} logs... ({attempt + 1}/60)"
-                print(f"Checking status for job {job_id}... ({attempt + 1}/60)")
-                status_url = f"https://{self.panorama}/api/?type=log&log-type={log_type}&action=get&job-id={job_id}&key={self.api_key}"
-                job_r = requests.get(status_url, verify=False, timeout=10)
-                job_root = ET.fromstring(job_r.text)
-                status = job_root.findtext(".//status")
-
-                print(f"Job status: {status}")
+        threading.Thread(target=sync_worker, daemon=True).start()
 
-                if status == "FIN":
-                    # Count how many entries we actually got
-                    entries_received = len(job_root.findall(".//entry"))
-                    print(f"Job completed! Received {entries_received} entries (requested {nlogs or 'default'})")
-
-                    # Use secure cache file path
-                    cache_file = self.get_cache_file_path(log_type)
-
-                    # Check for existing entries to merge
-                    if os.path.exists(cache_file):
-                        try:
-                            existing_tree = ET.parse(cache_file)
-                            existing_root = existing_tree.getroot()
-                            existing_entries = existing_root.findall(".//entry")
-                            latest = max((entry.findtext("time_generated") for entry in existing_entries if
-                                          entry.find("time_generated")), default="")
-                        except Exception as e:
-                            print(f"Error reading existing cache file: {e}")
-                            latest = ""
-                    else:
-                        latest = ""
-
-                    new_entries = []
-                    for entry in job_root.findall(".//entry"):
-                        tg = entry.findtext("time_generated")
-                        if tg and tg > latest:
-                            new_entries.append(entry)
-
-                    if new_entries:
-                        if os.path.exists(cache_file):
-                            tree = ET.parse(cache_file)
-                            root_element = tree.getroot().find(".//log")
-                        else:
-                            root_element = ET.Element("log")
-                            tree = ET.ElementTree(ET.Element("response"))
-                            ET.SubElement(tree.getroot(), "result").append(root_element)
-
-                        for entry in new_entries:
-                            root_element.append(entry)
-
-                        # Write to secure cache location
-                        tree.write(cache_file)
-                        # Set restrictive permissions on the cache file
-                        os.chmod(cache_file, 0o600)
-
-                    print(f"Merged {len(new_entries)} new {log_type} log entries into secure cache.")
-                    print(f"Total entries received from API: {entries_received}")
-                    break
-                elif status == "FAIL":
-                    error_details = job_root.findtext(".//details")
-                    print(f"Job failed: {error_details}")
-                    break
+    def refuse_during_sync(self, action):
+        """Alert and return True if a sync is running, so `action` has to wait for it."""
+        if not self._sync_lock.locked():
+            return False
+        rumps.alert("Sync In Progress", f"Please wait for the current sync to finish before {action}.")
+        return True
 
-                time.sleep(2)
-            else:
-                print(f"Job {job_id} did not complete in time for {log_type} logs.")
+    def finish_sync(self, error, done_message):
+        """Rebuild the log menus once a sync's worker is done, then release the sync."""
+        try:
+            if error is not None:
+                rumps.alert("Sync Failed", f"An error occurred during sync:\n{error}")
+                return
 
-            # After loop, reset app title
-            self.update_title()
+            # Rebuild menus with fresh data
+            self.build_config_log_menu()
+            self.build_system_log_menu()
+            self.build_failed_commit_menu()
 
-        except Exception as e:
-            print(f"Error downloading {log_type} logs: {e}")
+            print(
+                f"Refreshed logs for {self.panorama}: {len(getattr(self, 'config_logs', []))} config, {len(self.system_logs)} system")
+            if done_message:
+                rumps.alert("Sync Complete", done_message)
         finally:
-            # Always reset title after attempt, in case of early return/exception
-            self.update_title()
-
-    def download_and_merge_logs_with_skip(self, log_type, nlogs=None, skip=0):
-        """Download logs with skip parameter for pagination."""
+            self._sync_lock.release()
+
+    def run_downloads(self, *downloads):
+        """Run independent download callables in parallel and wait for all of them."""
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [executor.submit(download) for download in downloads]
+        for future in futures:
+            future.result()
+
+    def paginate_logs(self, log_type, total, page=5000):
+        """Download `total` logs in API-sized pages, newest first.
+
+        Yields the number of new entries merged from each page. Pages are buffered
+        in memory and written to the cache in one append after the last page.
+        """
+        with self.buffered_cache_writes(log_type):
+            for skip in range(0, total, page):
+                yield self.download_and_merge_logs(log_type, nlogs=min(page, total - skip), skip=skip)
+
+    def download_and_merge_logs(self, log_type, nlogs=None, skip=0):
+        """Download one chunk of logs and append the new entries to the cache.
+
+        Inside buffered_cache_writes() the entries are held in memory instead.
+        Returns the number of entries merged into the cache.
+        """
         nlogs_param = f"&nlogs={nlogs}" if nlogs else ""
         skip_param = f"&skip={skip}" if skip > 0 else ""
         print(f"Requesting {log_type} logs from {self.panorama} (nlogs={nlogs}, skip={skip})...")
         base_url = f"https://{self.panorama}/api/?type=log&log-type={log_type}{nlogs_param}{skip_param}&key={self.api_key}"
+        chunk_label = f" chunk {skip // nlogs + 1}" if skip > 0 and nlogs else ""
+        merged = 0
 
         try:
-            r = requests.get(base_url, verify=False, timeout=10)
+            r = self.session.get(base_url, timeout=10)
             print(f"API Response status: {r.status_code}")
-            root = ET.fromstring(r.text)
-
-            # Check for API errors
-            status = root.get('status')
-            if status == 'error':
-                error_msg = root.findtext('.//msg')
-                print(f"API Error: {error_msg}")
-                return
-
-            job_id = root.findtext(".//job")
-            if not job_id:
-                print(f"No job ID received for {log_type} logs (skip={skip})")
-                print(f"Response: {r.text[:500]}...")  # Print first 500 chars for debugging
-                return
-
-            # GUI notification: job started
-            try:
-                rumps.notification("Panorama Logs", f"Downloading {log_type} logs",
-                                   f"Chunk {2 if skip > 0 else 1} started ({nlogs or 'default'} logs)...")
-            except Exception as e:
-                print(f"Notification error (ignored): {e}")
+            match = _JOB_RE.search(r.content)
+            if match:
+                job_id = match.group(1).decode()
+            else:
+                # No job id where expected, parse the XML to report why
+                root = ET.fromstring(r.content)
+
+                # Check for API errors
+                status = root.get('status')
+                if status == 'error':
+                    error_msg = root.findtext('.//msg')
+                    print(f"API Error: {error_msg}")
+                    return merged
+
+                job_id = root.findtext(".//job")
+                if not job_id:
+                    print(f"No job ID received for {log_type} logs (skip={skip})")
+                    print(f"Response: {r.content[:500]}...")  # Print first 500 chars for debugging
+                    return merged
+
+            # GUI notification: job started. Downloads run off the main thread, so every
+            # notification and title change is handed to the main thread
+            AppHelper.callAfter(self.show_notification, f"Downloading {log_type} logs{chunk_label}",
+                                f"Job started (requesting {nlogs or 'default'} logs)...")
+
+            # Entries whose Log ID is already cached are skipped, whichever page they
+            # arrive on; newer entries and older (skip) entries are both merged
+            cached_ids = self.get_cached_log_ids(log_type)
 
             print(f"Log job {job_id} started, waiting for completion...")
-            # Increase to 60 attempts (~2 minutes)
-            for attempt in range(60):
-                # GUI status: update menu bar title with progress (only if not using icon-only mode)
-                chunk_label = f"chunk {2 if skip > 0 else 1}"
-                if not self.display_menu_icon:
-                    self.title = f"Fetching {log_type} logs {chunk_label}... ({attempt + 1}/60)"
-                print(f"Checking status for job {job_id}... ({attempt + 1}/60)")
+            # Poll with jittered exponential backoff, bounded by wall time rather than attempts
+            started = time.monotonic()
+            deadline = started + self.JOB_POLL_MAX_WAIT
+            delay = self.JOB_POLL_FIRST_DELAY
+            while time.monotonic() < deadline:
+                elapsed = int(time.monotonic() - started)
+                # GUI status: update menu bar title with progress
+                AppHelper.callAfter(self.show_progress_title, f"Fetching {log_type} logs{chunk_label}... ({elapsed}s)")
+                print(f"Checking status for job {job_id}... ({elapsed}s elapsed)")
                 status_url = f"https://{self.panorama}/api/?type=log&log-type={log_type}&action=get&job-id={job_id}&key={self.api_key}"
-                job_r = requests.get(status_url, verify=False, timeout=10)
-                job_root = ET.fromstring(job_r.text)
-                status = job_root.findtext(".//status")
+                status, details, entries_received, new_logs = self.fetch_job_entries(
+                    status_url, log_type, cached_ids)
 
                 print(f"Job status: {status}")
 
                 if status == "FIN":
-                    # Count how many entries we actually got
-                    entries_received = len(job_root.findall(".//entry"))
                     print(
                         f"Job completed! Received {entries_received} entries (requested {nlogs or 'default'}, skip={skip})")
 
-                    # Use secure cache file path
-                    cache_file = self.get_cache_file_path(log_type)
+                    if new_logs:
+                        self.store_cache_entries(log_type, new_logs)
+                        # Buffered entries aren't in the file yet, but later pages must skip them too
+                        cached_ids.update(log["Log ID"] for log in new_logs)
+                    merged = len(new_logs)
 
-                    # For skip requests, we always append (don't check for latest time)
-                    # since we're getting older logs
-                    if skip > 0:
-                        new_entries = job_root.findall(".//entry")
-                    else:
-                        # For the first request, still check for duplicates
-                        if os.path.exists(cache_file):
-                            try:
-                                existing_tree = ET.parse(cache_file)
-                                existing_root = existing_tree.getroot()
-                                existing_entries = existing_root.findall(".//entry")
-                                latest = max((entry.findtext("time_generated") for entry in existing_entries if
-                                              entry.find("time_generated")), default="")
-                            except Exception as e:
-                                print(f"Error reading existing cache file: {e}")
-                                latest = ""
-                        else:
-                            latest = ""
-
-                        new_entries = []
-                        for entry in job_root.findall(".//entry"):
-                            tg = entry.findtext("time_generated")
-                            if tg and tg > latest:
-                                new_entries.append(entry)
-
-                    if new_entries:
-                        if os.path.exists(cache_file):
-                            tree = ET.parse(cache_file)
-                            root_element = tree.getroot().find(".//log")
-                        else:
-                            root_element = ET.Element("log")
-                            tree = ET.ElementTree(ET.Element("response"))
-                            ET.SubElement(tree.getroot(), "result").append(root_element)
-
-                        for entry in new_entries:
-                            root_element.append(entry)
-
-                        # Write to secure cache location
-                        tree.write(cache_file)
-                        # Set restrictive permissions on the cache file
-                        os.chmod(cache_file, 0o600)
-
-                    print(f"Merged {len(new_entries)} new {log_type} log entries into secure cache (skip={skip}).")
+                    print(f"Merged {merged} new {log_type} log entries into secure cache (skip={skip}).")
                     break
                 elif status == "FAIL":
-                    error_details = job_root.findtext(".//details")
-                    print(f"Job failed: {error_details}")
+                    print(f"Job failed: {details}")
                     break
 
-                time.sleep(2)
+                # Never sleep past the deadline, so a timed-out job is reported promptly
+                time.sleep(min(delay + random.uniform(0, delay * 0.1),
+                               max(deadline - time.monotonic(), 0)))
+                delay = min(delay * 2, self.JOB_POLL_MAX_DELAY)
             else:
                 print(f"Job {job_id} did not complete in time for {log_type} logs (skip={skip}).")
 
-            # After loop, reset app title
-            self.update_title()
-
         except Exception as e:
-            print(f"Error downloading {log_type} logs with skip={skip}: {e}")
+            print(f"Error downloading {log_type} logs (skip={skip}): {e}")
         finally:
             # Always reset title after attempt, in case of early return/exception
-            self.update_title()
+            AppHelper.callAfter(self.update_title)
+        return merged
 
-    def pull_extended_logs(self, _):
+    def show_notification(self, subtitle, message):
+        """Post an app notification; a failure to show it is only logged."""
         try:
-            # Clear existing data structures
-            self.config_logs = []
-            self.system_logs = []
-            self.failed_commits = []
-
-            # Clear existing menus completely
-            self.clear_log_menus()
-
-            # Download and process new logs
-            self.download_and_merge_logs("config", nlogs=5000)
-            self.download_and_merge_logs("system", nlogs=5000)
-            self.parse_saved_config_logs(None)
-            self.parse_saved_system_logs()
-
-            # Rebuild menus with fresh data
-            self.build_config_log_menu()
-            self.build_system_log_menu()
-            self.build_failed_commit_menu()
-            rumps.alert("Sync Complete", "Log sync completed successfully.")
+            rumps.notification("Panorama Logs", subtitle, message)
         except Exception as e:
-            rumps.alert("Sync Failed", f"An error occurred during sync:\n{e}")
+            print(f"Notification error (ignored): {e}")
+
+    def show_progress_title(self, text):
+        """Show sync progress in the menu bar title, unless in icon-only mode."""
+        if not self.display_menu_icon:
+            self.title = text
+
+    @staticmethod
+    def iter_xml_elements(source):
+        """Stream-parse XML, yielding (parent_tag, element) as each element closes.
+
+        Elements inside an <entry> are not yielded on their own; the caller reads
+        them through the entry. Every <entry> is detached from its parent once the
+        caller has handled it, so memory only grows with the entries the caller
+        keeps a reference to.
+        """
+        stack = []
+        entry_depth = None  # stack depth of the <entry> being parsed, if any
+        for event, elem in ET.iterparse(source, events=("start", "end")):
+            if event == "start":
+                if entry_depth is None and elem.tag == "entry":
+                    entry_depth = len(stack)
+                stack.append(elem)
+                continue
+            stack.pop()
+            if entry_depth is not None:
+                if len(stack) > entry_depth:
+                    continue
+                entry_depth = None
+            parent = stack[-1] if stack else None
+            yield (parent.tag if parent is not None else None), elem
+            if elem.tag == "entry" and parent is not None:
+                parent.remove(elem)
+
+    def entry_to_log(self, log_type, entry):
+        """Convert an API <entry> element into the log dict stored in the cache.
+
+        Every value is a str (missing fields become ""), so readers never need str().
+        """
+        if log_type == "config":
+            fields, tags = self.CONFIG_LOG_FIELDS, self.CONFIG_LOG_TAGS
+        else:
+            fields, tags = self.SYSTEM_LOG_FIELDS, self.SYSTEM_LOG_TAGS
+        log = {"Log ID": entry.get("logid") or ""}
+        log.update((key, "") for key, _ in fields)
+        # One scan over the children instead of a findtext() search per field
+        for child in entry:
+            key = tags.get(child.tag)
+            if key:
+                log[key] = child.text or ""
+        return log
+
+    def get_cached_log_ids(self, log_type):
+        """Return the set of Log IDs already cached, including buffered entries not yet written.
+
+        The cache file is only read when nothing is known about it yet (first sync of
+        the session, or after it was replaced, removed or compacted). After that the set
+        is kept up to date as entries are stored, so a page costs O(new entries) rather
+        than a rescan of the whole cache.
+        """
+        cache_file = self.get_cache_file_path(log_type)
+        signature = self.get_cache_signature(cache_file) if os.path.exists(cache_file) else None
+        known = self._cached_log_ids.get(log_type)
+        if known and known[0] == signature:
+            return known[1]
+
+        log_ids = set()
+        if signature:
+            with open(cache_file, "rb") as f:
+                log_ids.update(_json_loads(line).get("Log ID") for line in f if line.strip())
+        with self._pending_lock:
+            log_ids.update(log["Log ID"] for log in self._pending_cache_writes.get(log_type, ()))
+        log_ids.discard("")
+        self._cached_log_ids[log_type] = (signature, log_ids)
+        return log_ids
+
+    def append_cache_entries(self, log_type, logs):
+        """Append log dicts to the JSONL cache, keeping its known Log ID set current."""
+        cache_file = self.get_cache_file_path(log_type)
+        before = self.get_cache_signature(cache_file) if os.path.exists(cache_file) else None
+
+        # Write to secure cache location, only touching the new entries. The entries
+        # go out in one write and are synced to disk, so a crash can't leave only part
+        # of a page behind.
+        with open(cache_file, "ab") as f:
+            f.write(b"".join(_json_line(log) for log in logs))
+            f.flush()
+            os.fsync(f.fileno())
+
+        # Set restrictive permissions on the cache file
+        os.chmod(cache_file, 0o600)
+
+        # The set described the file as it was before this write; move it along with the
+        # file. Otherwise the signature no longer matches and the next sync rescans.
+        known = self._cached_log_ids.get(log_type)
+        if known and known[0] == before:
+            known[1].update(log["Log ID"] for log in logs if log["Log ID"])
+            self._cached_log_ids[log_type] = (self.get_cache_signature(cache_file), known[1])
+
+    @contextmanager
+    def buffered_cache_writes(self, *log_types):
+        """Hold cache appends for `log_types` in memory and write each once on exit."""
+        with self._pending_lock:
+            for log_type in log_types:
+                self._buffering[log_type] += 1
+        try:
+            yield
+        finally:
+            with self._pending_lock:
+                done = []
+                for log_type in log_types:
+                    self._buffering[log_type] -= 1
+                    if not self._buffering[log_type]:
+                        del self._buffering[log_type]
+                        done.append(log_type)
+            for log_type in done:
+                self.flush_cache_writes(log_type)
+
+    def store_cache_entries(self, log_type, logs):
+        """Append log dicts to the cache, or buffer them inside buffered_cache_writes()."""
+        with self._pending_lock:
+            if self._buffering.get(log_type):
+                self._pending_cache_writes.setdefault(log_type, []).extend(logs)
+                return
+        self.append_cache_entries(log_type, logs)
+
+    def flush_cache_writes(self, log_type=None):
+        """Append buffered entries to the cache; all log types when `log_type` is None.
+
+        Also runs on quit (before_quit and atexit) so a quit mid-sync doesn't drop
+        downloaded pages. The lock is only held to take the buffered entries, never
+        across the disk writes, so a quit can't wait on a sync worker's write.
+        """
+        with self._pending_lock:
+            log_types = [log_type] if log_type else list(self._pending_cache_writes)
+            pending_writes = [(pending_type, self._pending_cache_writes.pop(pending_type, None))
+                              for pending_type in log_types]
+        for pending_type, pending in pending_writes:
+            if pending:
+                try:
+                    self.append_cache_entries(pending_type, pending)
+                except Exception as e:
+                    print(f"Error writing {pending_type} cache: {e}")
+                    # The known set already holds these IDs, so rebuild it from the file
+                    self._cached_log_ids.pop(pending_type, None)
+
+    def compact_cache_file(self, log_type, logs, duplicates):
+        """Rewrite a cache file without the duplicate entries that overlapping syncs append.
+
+        Syncs only ever append, so this is the one place the whole cache is rewritten,
+        and only when parsing has found duplicates to drop.
+        """
+        fields = self.CONFIG_LOG_FIELDS if log_type == "config" else self.SYSTEM_LOG_FIELDS
+        cache_file = self.get_cache_file_path(log_type)
+        tmp_file = cache_file + ".tmp"
+        try:
+            before = self.get_cache_signature(cache_file)
+            with open(tmp_file, "wb") as f:
+                f.writelines(
+                    _json_line({"Log ID": log["Log ID"], **{key: log[key] for key, _ in fields}})
+                    for log in logs
+                )
+            os.chmod(tmp_file, 0o600)
+            os.replace(tmp_file, cache_file)
+            # Compacting keeps the same Log IDs, so only the file signature moves
+            known = self._cached_log_ids.get(log_type)
+            if known and known[0] == before:
+                self._cached_log_ids[log_type] = (self.get_cache_signature(cache_file), known[1])
+            print(f"Compacted {log_type} cache: dropped {duplicates} duplicate entries")
+        except Exception as e:
+            print(f"Error compacting {log_type} cache: {e}")
+
+    def fetch_job_entries(self, status_url, log_type, cached_ids):
+        """Poll a log job once, streaming the response instead of loading it whole.
+
+        Returns (status, details, entries_received, new_logs). Entries whose Log ID
+        is in `cached_ids`, or repeats within the response, are dropped.
+        """
+        status = None
+        details = None
+        entries_received = 0
+        new_logs = []
+        new_ids = set()
+        with self.session.get(status_url, timeout=10, stream=True) as job_r:
+            job_r.raw.decode_content = True
+            for parent_tag, elem in self.iter_xml_elements(job_r.raw):
+                if elem.tag == "entry":
+                    entries_received += 1
+                    log_id = elem.get("logid")
+                    if log_id:
+                        if log_id in cached_ids or log_id in new_ids:
+                            continue
+                        new_ids.add(log_id)
+                    new_logs.append(self.entry_to_log(log_type, elem))
+                elif elem.tag == "status" and parent_tag == "job":
+                    status = elem.text
+                elif elem.tag == "details" and details is None:
+                    details = elem.text
+            # Read any bytes left after the root element: a streamed response that isn't
+            # fully consumed closes its connection instead of returning it to the pool
+            job_r.raw.read()
+        return status, details, entries_received, new_logs
+
+    def pull_extended_logs(self, _):
+        self.start_sync(self.download_extended_logs, "Log sync completed successfully.")
+
+    def download_extended_logs(self):
+        # Download new logs, writing each cache once
+        with self.buffered_cache_writes("config", "system"):
+            self.run_downloads(partial(self.download_and_merge_logs, "config", nlogs=5000),
+                               partial(self.download_and_merge_logs, "system", nlogs=5000))
+
+    def reparse_saved_config_logs(self, _):
+        """Menu callback for re-processing the cached config logs."""
+        # The sync worker parses (and may compact) the cache itself before it finishes
+        if self.refuse_during_sync("parsing saved logs"):
+            return
+        self.parse_saved_config_logs(None)
 
     def parse_saved_config_logs(self, _):
         try:
@@ -796,43 +1014,65 @@ class PanoramaAdminLogAppV2(rumps.App):
             if not os.path.exists(cache_file):
                 print(f"No config cache file found: {cache_file}")
                 self.config_logs = []
+                self.config_logs_grouped = {}
+                return
+
+            # Nothing was appended since the last parse, so its results still hold
+            signature = self.get_cache_signature(cache_file)
+            parsed = self._parsed_caches.pop("config", None)
+            if parsed and parsed[0] == signature:
+                self.config_logs, self.failed_commits, self.config_logs_grouped, self.failed_commits_grouped = parsed[1]
+                self._parsed_caches["config"] = parsed
+                print(f"Config cache unchanged, reusing {len(self.config_logs)} parsed logs")
                 return
 
-            tree = ET.parse(cache_file)
-            root = tree.getroot()
             self.failed_commits = []
             self.config_logs = []
+            # admin -> cmd -> logs and admin -> failed logs, so menu rebuilds don't regroup
+            self.config_logs_grouped = {}
+            self.failed_commits_grouped = {}
+            # One add() per entry; the set only grows when the id is new
             seen_log_ids = set()
-
-            for i, entry in enumerate(root.findall(".//entry"), start=1):
-                log_id = entry.attrib.get("logid")
-                if log_id and log_id in seen_log_ids:
-                    continue
-                if log_id:
-                    seen_log_ids.add(log_id)
-
-                log = {
-                    "Log ID": log_id,
-                    "Received": entry.findtext("receive_time"),
-                    "Firewall Serial": entry.findtext("serial"),
-                    "Device Name": entry.findtext("device_name"),
-                    "Source IP": entry.findtext("host"),
-                    "Command Type": entry.findtext("cmd"),
-                    "Admin": entry.findtext("admin"),
-                    "Access Method": entry.findtext("client"),
-                    "Result": entry.findtext("result"),
-                    "Config Section": entry.findtext("path"),
-                    "Full Path": entry.findtext("full-path"),
-                }
-                self.config_logs.append(log)
-                if log["Result"] and "fail" in log["Result"].lower():
-                    self.failed_commits.append(log)
+            seen_add = seen_log_ids.add
+            unique = 0
+            duplicates = 0
+
+            with open(cache_file, "rb") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    log = _json_loads(line)
+                    log_id = log.get("Log ID")
+                    if log_id:
+                        seen_add(log_id)
+                        if len(seen_log_ids) == unique:
+                            duplicates += 1
+                            continue
+                        unique += 1
+
+                    # Lowercased copy of every field searched by search_logs, one per line
+                    # so a search term can't match across two fields
+                    log["_search_blob"] = "\n".join(v.lower() for v in log.values())
+                    log["_time_str"] = self.format_received_time(log["Received"])
+                    self.config_logs.append(log)
+                    admin = log["Admin"]
+                    self.config_logs_grouped.setdefault(admin, {}).setdefault(log["Command Type"], []).append(log)
+                    if log["Result"] and "fail" in log["Result"].lower():
+                        self.failed_commits.append(log)
+                        self.failed_commits_grouped.setdefault(admin, []).append(log)
 
             print(f"Parsed {len(self.config_logs)} config logs from cache")
+            if duplicates:
+                self.compact_cache_file("config", self.config_logs, duplicates)
+            else:
+                self._parsed_caches["config"] = (signature, (self.config_logs, self.failed_commits,
+                                                             self.config_logs_grouped, self.failed_commits_grouped))
         except Exception as e:
             print(f"Config Parse Error: {e}")
             self.config_logs = []
             self.failed_commits = []
+            self.config_logs_grouped = {}
+            self.failed_commits_grouped = {}
 
     def parse_saved_system_logs(self):
         try:
@@ -842,102 +1082,176 @@ class PanoramaAdminLogAppV2(rumps.App):
                 self.system_logs = []
                 return
 
-            tree = ET.parse(cache_file)
-            root = tree.getroot()
+            # Nothing was appended since the last parse, so its results still hold
+            signature = self.get_cache_signature(cache_file)
+            parsed = self._parsed_caches.pop("system", None)
+            if parsed and parsed[0] == signature:
+                self.system_logs = parsed[1]
+                self._parsed_caches["system"] = parsed
+                print(f"System cache unchanged, reusing {len(self.system_logs)} parsed logs")
+                return
+
             self.system_logs = []
+            # One add() per entry; the set only grows when the id is new
             seen_log_ids = set()
-
-            for i, entry in enumerate(root.findall(".//entry"), start=1):
-                log_id = entry.attrib.get("logid")
-                if log_id in seen_log_ids:
-                    continue
-                seen_log_ids.add(log_id)
-                self.system_logs.append({
-                    "Entry #": i,
-                    "Log ID": log_id,
-                    "Time": entry.findtext("time_generated"),
-                    "Type": entry.findtext("type"),
-                    "Severity": entry.findtext("severity"),
-                    "Event": entry.findtext("eventid"),
-                    "Description": entry.findtext("opaque"),
-                    "Admin": entry.findtext("admin"),
-                    "Host": entry.findtext("host"),
-                    "Client": entry.findtext("client"),
-                })
+            seen_add = seen_log_ids.add
+            duplicates = 0
+
+            with open(cache_file, "rb") as f:
+                for i, line in enumerate(f, start=1):
+                    if not line.strip():
+                        continue
+                    log = _json_loads(line)
+                    seen_add(log.get("Log ID"))
+                    if len(seen_log_ids) == len(self.system_logs):
+                        duplicates += 1
+                        continue
+                    self.system_logs.append({"Entry #": i, **log})
 
             print(f"Parsed {len(self.system_logs)} system logs from cache")
+            if duplicates:
+                self.compact_cache_file("system", self.system_logs, duplicates)
+            else:
+                self._parsed_caches["system"] = (signature, self.system_logs)
         except Exception as e:
             print(f"System Parse Error: {e}")
             self.system_logs = []
 
+    @staticmethod
+    def get_cache_signature(cache_file):
+        """Identify a cache file's contents by path, mtime and size.
+
+        The cache is only ever appended to or replaced, and either changes the
+        size or the modification time, so hashing the contents isn't needed.
+        """
+        st = os.stat(cache_file)
+        return cache_file, st.st_mtime_ns, st.st_size
+
+    @staticmethod
+    def format_received_time(received):
+        """Format a "YYYY/MM/DD HH:MM:SS" receive time as "Jan 05, 2026 03:04 PM".
+
+        Same output as strptime()/strftime(), but by slicing, since it runs once per
+        cached config log on every parse. Values the slicing can't fully validate
+        go through strptime, and anything it rejects is returned unchanged.
+        """
+        try:
+            if (len(received) == 19 and received[4] == received[7] == "/" and received[10] == " "
+                    and received[13] == received[16] == ":"):
+                digits = received[0:4] + received[5:7] + received[8:10] + received[11:13] + received[14:16] + received[17:19]
+                # Years before 1000 are padded differently by strftime on some platforms
+                if digits.isascii() and digits.isdigit() and received[0] != "0":
+                    month = int(received[5:7])
+                    hour = int(received[11:13])
+                    # Days 29-31 depend on the month and year, so leave those to strptime
+                    if (1 <= month <= 12 and 1 <= int(received[8:10]) <= 28 and hour < 24
+                            and int(received[14:16]) < 60 and int(received[17:19]) < 60):
+                        return (f"{_MONTHS[month - 1]} {received[8:10]}, {received[0:4]} "
+                                f"{(hour % 12) or 12:02d}:{received[14:16]} {'PM' if hour >= 12 else 'AM'}")
+            dt = datetime.strptime(received, "%Y/%m/%d %H:%M:%S")
+            return dt.strftime("%b %d, %Y %I:%M %p")
+        except Exception:
+            return received
+
+    def add_menu_batch(self, menu, logs, make_item, start=0):
+        """Add the next MENU_BATCH_SIZE log items to a submenu, plus a "More…" item for the rest.
+
+        Every rumps MenuItem is an NSMenuItem created across the PyObjC bridge, so
+        entries past the first batch are only built when the user asks for them.
+        """
+        end = start + self.MENU_BATCH_SIZE
+        items = [make_item(log) for log in logs[start:end]]
+        if end < len(logs):
+            def show_more(sender):
+                del menu[sender.title]
+                self.add_menu_batch(menu, logs, make_item, end)
+            items.append(rumps.MenuItem(f"More… ({len(logs) - end} remaining)", callback=show_more))
+        menu.update(items)
+
+    def add_lazy_menu_batch(self, menu, logs, make_item):
+        """Like add_menu_batch(), but large submenus start with a "Show…" placeholder.
+
+        rumps can't run code when a submenu opens, so the placeholder's click builds
+        the first batch; until then only the placeholder crosses the PyObjC bridge.
+        """
+        if len(logs) <= self.MENU_EAGER_SIZE:
+            self.add_menu_batch(menu, logs, make_item)
+            return
+
+        def show_entries(sender):
+            del menu[sender.title]
+            self.add_menu_batch(menu, logs, make_item)
+        menu.add(rumps.MenuItem(f"Show {len(logs)} entries…", callback=show_entries))
+
     def build_config_log_menu(self):
         if hasattr(self.config_log_menu, 'menu'):
             self.config_log_menu.menu = {}
-        admin_groups = defaultdict(list)
-        for log in getattr(self, "config_logs", []):
-            admin = log.get("Admin", "Unknown")
+        # Build each level in Python first, then attach it with a single update() call
+        admin_menus = []
+        for admin, type_groups in self.config_logs_grouped.items():
             # Skip Panorama system users if the option is enabled
             if self.hide_panorama_users and admin.startswith("Panorama-"):
                 continue
-            admin_groups[admin].append(log)
-        for admin, logs in admin_groups.items():
-            admin_menu = rumps.MenuItem(f"Admin: {admin}", callback=None)
-            type_groups = defaultdict(list)
-            for log in logs:
-                cmd = log.get("Command Type", "Unknown")
-                type_groups[cmd].append(log)
-            for cmd_type, typed_logs in type_groups.items():
-                type_menu = rumps.MenuItem(cmd_type, callback=None)
-                for log in typed_logs:
-                    try:
-                        dt = datetime.strptime(log.get("Received", ""), "%Y/%m/%d %H:%M:%S")
-                        time_str = dt.strftime("%b %d, %Y %I:%M %p")
-                    except Exception:
-                        time_str = log.get("Received", "")
-                    # Extended emoji selection logic for command types
-                    cmd_type_lower = cmd_type.lower()
-                    if "set" in cmd_type_lower:
-                        emoji = "⚙️"
-                    elif "edit" in cmd_type_lower:
-                        emoji = "✏️"
-                    elif "revert" in cmd_type_lower:
-                        emoji = "↩️"
-                    elif "commit-and-push" in cmd_type_lower:
-                        emoji = "📤"
-                    elif "commit" in cmd_type_lower:
-                        emoji = "✅"
-                    elif "delete" in cmd_type_lower:
-                        emoji = "🗑️"
-                    elif "add" in cmd_type_lower:
-                        emoji = "➕"
-                    elif "move" in cmd_type_lower:
-                        emoji = "📦"
-                    elif "rename" in cmd_type_lower:
-                        emoji = "📝"
-                    elif "multi-clone" in cmd_type_lower:
-                        emoji = "🧬"
-                    elif "multi-move" in cmd_type_lower:
-                        emoji = "🛫"
-                    elif "upload" in cmd_type_lower:
-                        emoji = "📤"
-                    elif "request" in cmd_type_lower:
-                        emoji = "📥"
-                    elif "clone" in cmd_type_lower:
-                        emoji = "🔁"
-                    elif "override" in cmd_type_lower:
-                        emoji = "⛔"
-                    else:
-                        emoji = "📜"
-                    config_section = log.get("Config Section", "")
-                    if config_section and config_section.lower() != "none":
-                        formatted_path = " | ".join(config_section.split())
-                        label = f"{emoji} {formatted_path} | 🕒 {time_str}"
-                    else:
-                        label = f"{emoji} {admin} | 🕒 {time_str}"
-                    hover_item = rumps.MenuItem(label, callback=lambda _, l=log: self.show_entry_details(l))
-                    type_menu.add(hover_item)
-                admin_menu.add(type_menu)
-            self.config_log_menu.add(admin_menu)
+            admin_menus.append(self.make_config_admin_menu(admin, type_groups))
+        self.config_log_menu.update(admin_menus)
+
+    def make_config_admin_menu(self, admin, type_groups):
+        admin_menu = rumps.MenuItem(f"Admin: {admin}", callback=None)
+        type_menus = []
+        for cmd_type, typed_logs in type_groups.items():
+            type_menu = rumps.MenuItem(cmd_type, callback=None)
+            emoji = self.CMD_EMOJI.get(cmd_type.lower()) or self.cmd_type_emoji(cmd_type.lower())
+            self.add_lazy_menu_batch(type_menu, typed_logs, partial(self.make_config_log_item, admin, emoji))
+            type_menus.append(type_menu)
+        admin_menu.update(type_menus)
+        return admin_menu
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def cmd_type_emoji(cmd_type_lower):
+        """Pick a menu emoji for a cmd value missing from CMD_EMOJI by substring match."""
+        # Order matters: more specific names must be checked before the names they contain
+        if "multi-move" in cmd_type_lower:
+            return "🛫"
+        elif "multi-clone" in cmd_type_lower:
+            return "🧬"
+        elif "set" in cmd_type_lower:
+            return "⚙️"
+        elif "edit" in cmd_type_lower:
+            return "✏️"
+        elif "revert" in cmd_type_lower:
+            return "↩️"
+        elif "commit-and-push" in cmd_type_lower:
+            return "📤"
+        elif "commit" in cmd_type_lower:
+            return "✅"
+        elif "delete" in cmd_type_lower:
+            return "🗑️"
+        elif "add" in cmd_type_lower:
+            return "➕"
+        elif "move" in cmd_type_lower:
+            return "📦"
+        elif "rename" in cmd_type_lower:
+            return "📝"
+        elif "upload" in cmd_type_lower:
+            return "📤"
+        elif "request" in cmd_type_lower:
+            return "📥"
+        elif "clone" in cmd_type_lower:
+            return "🔁"
+        elif "override" in cmd_type_lower:
+            return "⛔"
+        return "📜"
+
+    def make_config_log_item(self, admin, emoji, log):
+        time_str = log["_time_str"]
+        config_section = log.get("Config Section", "")
+        if config_section and config_section.lower() != "none":
+            formatted_path = " | ".join(config_section.split())
+            label = f"{emoji} {formatted_path} | 🕒 {time_str}"
+        else:
+            label = f"{emoji} {admin} | 🕒 {time_str}"
+        return rumps.MenuItem(label, callback=lambda _, l=log: self.show_entry_details(l))
 
     def build_system_log_menu(self):
         if hasattr(self.system_log_menu, 'menu'):
@@ -945,50 +1259,56 @@ class PanoramaAdminLogAppV2(rumps.App):
         groups = defaultdict(list)
         for log in self.system_logs:
             groups[log.get("Severity", "Unknown")].append(log)
+        submenus = []
         for sev, logs in groups.items():
             submenu = rumps.MenuItem(f"Severity: {sev}", callback=None)
-            for log in logs:
-                label = f"{log.get('Type', '')} | {log.get('Severity', '')} | {log.get('Event', '')} | {log.get('Admin', '')} | {log.get('Time', '')}"
-                submenu.add(rumps.MenuItem(label, callback=lambda _, l=log: self.show_system_entry_details(l)))
-            self.system_log_menu.add(submenu)
+            self.add_menu_batch(submenu, logs, self.make_system_log_item)
+            submenus.append(submenu)
+        self.system_log_menu.update(submenus)
+
+    def make_system_log_item(self, log):
+        label = f"{log.get('Type', '')} | {log.get('Severity', '')} | {log.get('Event', '')} | {log.get('Admin', '')} | {log.get('Time', '')}"
+        return rumps.MenuItem(label, callback=lambda _, l=log: self.show_system_entry_details(l))
 
     def build_failed_commit_menu(self):
         if hasattr(self.failed_commit_menu, 'menu'):
             self.failed_commit_menu.menu = {}
-        groups = defaultdict(list)
-        for log in self.failed_commits:
-            admin = log.get("Admin", "Unknown")
+        submenus = []
+        for admin, logs in self.failed_commits_grouped.items():
             # Skip Panorama system users if the option is enabled
             if self.hide_panorama_users and admin.startswith("Panorama-"):
                 continue
-            groups[admin].append(log)
-        for admin, logs in groups.items():
-            submenu = rumps.MenuItem(f"{admin} failed: {len(logs)}", callback=None)
-            for log in logs:
-                try:
-                    dt = datetime.strptime(log.get("Received", ""), "%Y/%m/%d %H:%M:%S")
-                    time_str = dt.strftime("%b %d, %Y %I:%M %p")
-                except:
-                    time_str = log.get("Received", "")
-                config_section = log.get("Config Section", "")
-                if config_section and config_section.lower() != "none":
-                    formatted_path = " | ".join(config_section.split())
-                    label = f"{formatted_path} @ {time_str}"
-                else:
-                    label = f"{log.get('Command Type', '')[:20]}... @ {time_str}"
-                submenu.add(rumps.MenuItem(label, callback=lambda _, l=log: self.show_entry_details(l)))
-            self.failed_commit_menu.add(submenu)
+            submenus.append(self.make_failed_admin_menu(admin, logs))
+        self.failed_commit_menu.update(submenus)
+
+    def make_failed_admin_menu(self, admin, logs):
+        submenu = rumps.MenuItem(f"{admin} failed: {len(logs)}", callback=None)
+        self.add_menu_batch(submenu, logs, self.make_failed_commit_item)
+        return submenu
+
+    def make_failed_commit_item(self, log):
+        time_str = log["_time_str"]
+        config_section = log.get("Config Section", "")
+        if config_section and config_section.lower() != "none":
+            formatted_path = " | ".join(config_section.split())
+            label = f"{formatted_path} @ {time_str}"
+        else:
+            label = f"{log.get('Command Type', '')[:20]}... @ {time_str}"
+        return rumps.MenuItem(label, callback=lambda _, l=log: self.show_entry_details(l))
 
     def show_entry_details(self, log):
-        detail = ""
+        parts = []
         for k, v in sorted(log.items()):
+            if k.startswith("_"):
+                continue  # Internal precomputed fields
             if k == "Config Section":
                 formatted_path = " | ".join(v.split()) if v else ""
-                detail += f"\n{k}: {formatted_path}\n\n"
+                parts.append(f"\n{k}: {formatted_path}\n\n")
             elif k == "Full Path":
-                detail += f"\n{k}: {v}\n\n"
+                parts.append(f"\n{k}: {v}\n\n")
             else:
-                detail += f"{k}: {v}\n"
+                parts.append(f"{k}: {v}\n")
+        detail = "".join(parts)
 
         result = rumps.Window(
             default_text=detail,
@@ -1008,12 +1328,8 @@ class PanoramaAdminLogAppV2(rumps.App):
                 rumps.alert("Copy Failed", f"Could not copy to clipboard: {e}")
 
     def show_system_entry_details(self, log):
-        detail = ""
-        for k, v in log.items():
-            if k == "Description":
-                detail += f"\n{k}: {v}\n\n"
-            else:
-                detail += f"{k}: {v}\n"
+        detail = "".join(f"\n{k}: {v}\n\n" if k == "Description" else f"{k}: {v}\n"
+                         for k, v in log.items())
 
         result = rumps.Window(
             default_text=detail,
@@ -1038,13 +1354,39 @@ class PanoramaAdminLogAppV2(rumps.App):
         self.save_config()
         self.update_hide_panorama_users_menu()
 
-        # Rebuild the config log menu to apply the filter
-        self.build_config_log_menu()
-        self.build_failed_commit_menu()
+        # Add or remove only the Panorama system users' menus. While a sync runs the
+        # menus are empty and finish_sync() applies the setting when it rebuilds them
+        if not self._sync_lock.locked():
+            self.apply_hide_panorama_users()
 
         status = "enabled" if self.hide_panorama_users else "disabled"
         rumps.alert("Setting Updated", f"Hide Panorama Users is now {status}")
 
+    def apply_hide_panorama_users(self):
+        """Show or hide the Panorama-* admins in the config and failed commit menus."""
+        config_menus = []
+        failed_menus = []
+        for admin, type_groups in self.config_logs_grouped.items():
+            if not admin.startswith("Panorama-"):
+                continue
+            title = f"Admin: {admin}"
+            if not self.hide_panorama_users:
+                config_menus.append(self.make_config_admin_menu(admin, type_groups))
+            elif title in self.config_log_menu:
+                del self.config_log_menu[title]
+        for admin, logs in self.failed_commits_grouped.items():
+            if not admin.startswith("Panorama-"):
+                continue
+            title = f"{admin} failed: {len(logs)}"
+            if not self.hide_panorama_users:
+                failed_menus.append(self.make_failed_admin_menu(admin, logs))
+            elif title in self.failed_commit_menu:
+                del self.failed_commit_menu[title]
+        if config_menus:
+            self.config_log_menu.update(config_menus)
+        if failed_menus:
+            self.failed_commit_menu.update(failed_menus)
+
     def update_hide_panorama_users_menu(self):
         """Update the menu item to show current state."""
         if self.hide_panorama_users:
@@ -1082,11 +1424,15 @@ class PanoramaAdminLogAppV2(rumps.App):
             self.title = "Panorama Logs"
 
     def force_clear_and_reload_logs(self, _):
+        if self.refuse_during_sync("clearing the cache"):
+            return
         # Clear cache files for current panorama
         self.clear_cache_files(self.panorama)
         self.refresh_logs(None)
 
     def clear_credentials(self, _):
+        if self.refuse_during_sync("clearing credentials"):
+            return
         if os.path.exists(CONFIG_PATH):
             os.remove(CONFIG_PATH)
         # Also clear all cache files
@@ -1102,9 +1448,8 @@ class PanoramaAdminLogAppV2(rumps.App):
         cache_size = "Unknown"
         try:
             if os.path.exists(self.cache_dir):
-                total_size = sum(os.path.getsize(os.path.join(self.cache_dir, f))
-                                 for f in os.listdir(self.cache_dir)
-                                 if os.path.isfile(os.path.join(self.cache_dir, f)))
+                with os.scandir(self.cache_dir) as it:
+                    total_size = sum(entry.stat().st_size for entry in it if entry.is_file())
                 cache_size = f"{total_size / 1024 / 1024:.1f} MB"
         except:
             pass
@@ -1211,12 +1556,14 @@ Logs are cached locally for faster access with secure permissions. Use sync opti
     def switch_to_panorama(self, name):
         """Switch the active Panorama context and refresh logs."""
 
+        # A running sync would keep fetching from, and caching for, the old Panorama
+        if self.refuse_during_sync("switching"):
+            return
+
         print(f"Starting switch to Panorama: {name}")
 
         # 1. Clear ALL cached data structures completely
-        self.config_logs = []
-        self.system_logs = []
-        self.failed_commits = []
+        self.reset_log_data()
 
         # 2. Clear and recreate all log menus to prevent persistence
         self.clear_log_menus()
@@ -1250,5 +1597,4 @@ Logs are cached locally for faster access with secure permissions. Use sync opti
 
 
 if __name__ == "__main__":
-    requests.packages.urllib3.disable_warnings()
     PanoramaAdminLogAppV2().run()
\ No newline at end of file